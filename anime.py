@@ -1,18 +1,29 @@
 import streamlit as st
 import requests
-import pandas as pd
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import collections
+import json
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+from enum import IntEnum
+from pathlib import Path
 
-# Page configuration
-st.set_page_config(
-    page_title="Anime Hub",
-    page_icon="🎌",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Custom CSS for better styling
-st.markdown("""
+_CSS_BLOCK = """
     <style>
     .main {
         background-color: #0e1117;
@@ -50,60 +61,381 @@ st.markdown("""
         background-color: #ff5252;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+_FOOTER_HTML = """
+    <div style='text-align: center; color: #666;'>
+        <p>Powered by <a href='https://jikan.moe/' target='_blank'>Jikan API</a> (Unofficial MyAnimeList API)</p>
+        <p>Made with ❤️ using Streamlit</p>
+    </div>
+"""
+
+# Page configuration
+st.set_page_config(
+    page_title="Anime Hub",
+    page_icon="🎌",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS for better styling (emitted on every rerun: Streamlit drops
+# elements that a rerun does not re-send, so this cannot be cached away)
+st.markdown(_CSS_BLOCK, unsafe_allow_html=True)
+
+# Favorites are kept per browser session in a dict (O(1) membership). Saving
+# them to disk is opt-in: set ANIME_HUB_FAVORITES_FILE to a JSON file path.
+# That file is shared by every session of the server process (the app has no
+# user accounts), so only enable it for a single-user local install.
+FAVORITES_FILE = (Path(os.environ["ANIME_HUB_FAVORITES_FILE"]).expanduser()
+                  if os.environ.get("ANIME_HUB_FAVORITES_FILE") else None)
+
+@st.cache_resource
+def _favorites_lock():
+    """Serializes reads and read-modify-writes of FAVORITES_FILE across sessions"""
+    return threading.Lock()
+
+def _read_favorites_file():
+    """Read saved favorite ids; a missing file is empty, a corrupt one raises ValueError"""
+    try:
+        text = FAVORITES_FILE.read_text()
+    except FileNotFoundError:
+        return {}
+    ids = json.loads(text)
+    if not isinstance(ids, list):
+        raise ValueError("favorites file does not hold a list of ids")
+    return dict.fromkeys(ids)
+
+def _write_favorites_file(favorites):
+    """Atomically replace FAVORITES_FILE so a crash never leaves it half-written"""
+    FAVORITES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=FAVORITES_FILE.parent, prefix=FAVORITES_FILE.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as tmp:
+            json.dump(list(favorites), tmp)
+        os.replace(tmp_path, FAVORITES_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_favorites():
+    """Load saved favorite ids, or start empty if persistence is off or nothing is saved"""
+    if FAVORITES_FILE is None:
+        return {}
+    try:
+        with _favorites_lock():
+            return _read_favorites_file()
+    except (OSError, ValueError) as e:
+        st.warning(f"Could not load favorites: {e}")
+        return {}
+
+def update_favorites(change):
+    """Apply change to this session's favorites, and to the saved file when persistence is on"""
+    if FAVORITES_FILE is None:
+        change(st.session_state.favorites)
+        return
+    try:
+        with _favorites_lock():
+            # Re-read so changes saved from other sessions are kept
+            favorites = _read_favorites_file()
+            change(favorites)
+            _write_favorites_file(favorites)
+    except (OSError, ValueError) as e:
+        # Never overwrite a file that could not be read
+        st.warning(f"Could not save favorites: {e}")
+        return
+    st.session_state.favorites = favorites
+
+if FAVORITES_FILE is not None:
+    # Reload on every rerun so changes saved from other sessions show up
+    st.session_state.favorites = load_favorites()
+elif 'favorites' not in st.session_state:
+    st.session_state.favorites = {}
+
+JIKAN_BASE_URL = "https://api.jikan.moe/v4"
+
+# Cache TTLs (seconds) per Jikan endpoint category
+CACHE_TTL = {
+    'top': 86400,       # rankings shift daily
+    'seasons': 86400,   # season listings rarely change
+    'search': 604800,   # search results are stable for about a week
+    'anime': 86400,     # per-anime details
+}
+
+# requests-cache expiry per URL pattern, matching CACHE_TTL (first match wins,
+# so anime details must come before the /anime search pattern)
+_JIKAN_HOST_PATH = JIKAN_BASE_URL.split('://')[-1]
+URLS_EXPIRE_AFTER = {
+    f"{_JIKAN_HOST_PATH}/top/": CACHE_TTL['top'],
+    f"{_JIKAN_HOST_PATH}/seasons/": CACHE_TTL['seasons'],
+    f"{_JIKAN_HOST_PATH}/anime/": CACHE_TTL['anime'],
+    f"{_JIKAN_HOST_PATH}/anime?": CACHE_TTL['search'],
+}
+
+# Worker threads for the favorites fan-out
+MAX_PARALLEL_REQUESTS = 4
+
+# Jikan allows 3 requests per second and 60 per minute
+RATE_LIMITS = ((3, 1.0), (60, 60.0))
 
-# Initialize session state
-if 'favorites' not in st.session_state:
-    st.session_state.favorites = []
+@st.cache_resource
+def _rate_limit_state():
+    """Recent request timestamps and their lock, shared across reruns and threads"""
+    return collections.deque(maxlen=max(limit for limit, _ in RATE_LIMITS)), threading.Lock()
+
+def _throttle():
+    """Block until another Jikan request fits within RATE_LIMITS"""
+    timestamps, lock = _rate_limit_state()
+    with lock:
+        while True:
+            now = time.monotonic()
+            wait = 0.0
+            for limit, window in RATE_LIMITS:
+                if len(timestamps) >= limit:
+                    wait = max(wait, timestamps[-limit] + window - now)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        timestamps.append(time.monotonic())
+
+class ThrottledAdapter(HTTPAdapter):
+    """HTTPAdapter that waits for a rate-limit slot before each network send.
+
+    requests-cache answers cache hits before reaching the adapter, so only
+    real sends to Jikan count against RATE_LIMITS.
+    """
+    def send(self, request, **kwargs):
+        _throttle()
+        return super().send(request, **kwargs)
+
+class ThrottledRetry(Retry):
+    """Retry policy whose resends (done inside urllib3) also wait for a rate-limit slot"""
+    def sleep(self, response=None):
+        super().sleep(response)
+        _throttle()
+
+# Shared HTTP session so every Jikan call reuses a pooled keep-alive connection.
+# With requests-cache installed, responses are also persisted to SQLite so they
+# survive restarts; st.cache_data stays the in-process tier on top of it.
+@st.cache_resource
+def get_session():
+    """Create the HTTP session once per process (the script itself reruns on every interaction)"""
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            'jikan_cache',
+            backend='sqlite',
+            expire_after=3600,
+            urls_expire_after=URLS_EXPIRE_AFTER,
+            allowable_codes=(200,),
+            stale_if_error=True
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'User-Agent': 'anime-hub/1.0'
+    })
+    session.mount('https://', ThrottledAdapter(
+        pool_connections=1,  # every request goes to api.jikan.moe
+        # The session is shared by all user sessions, the favorites workers and
+        # the prefetch thread; block for a free connection rather than
+        # discarding extras and paying for new handshakes
+        pool_maxsize=16,
+        pool_block=True,
+        max_retries=ThrottledRetry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    ))
+    return session
+
+SESSION = get_session()
+
+def decode_json(response):
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Raw Jikan fields the UI reads; everything else is dropped before caching
+ANIME_FIELDS = ('mal_id', 'title', 'title_english', 'score', 'episodes',
+                'year', 'status', 'synopsis', 'url')
+
+def _slim_anime(anime):
+    """Project one anime to ANIME_FIELDS plus its precomputed display fields"""
+    images = (anime.get('images') or {}).get('jpg') or {}
+    slim = {key: anime.get(key) for key in ANIME_FIELDS}
+    slim['_genre_text'] = " • ".join(g['name'] for g in (anime.get('genres') or [])[:5])
+    slim['_image_url'] = images.get('image_url')
+    slim['_image_url_large'] = images.get('large_image_url')
+    slim['_trailer_url'] = (anime.get('trailer') or {}).get('url')
+    return slim
+
+def annotate_anime(payload):
+    """Shrink every anime in a Jikan payload to what the UI displays.
+
+    Runs once on the (cached) fetch path, so the cache holds only the
+    fields cards read and rendering uses ready-made strings on each rerun.
+    """
+    items = payload.get('data')
+    if isinstance(items, dict):
+        payload['data'] = _slim_anime(items)
+    elif items:
+        payload['data'] = [_slim_anime(anime) for anime in items]
+    return payload
+
+# Each Jikan endpoint is described once; both the cache gate and _jikan_get
+# read the method and path from here, so what is cached is what is sent
+JikanEndpoint = collections.namedtuple('JikanEndpoint', 'method path category')
+
+TOP_ANIME = JikanEndpoint('GET', '/top/anime', 'top')
+SEARCH_ANIME = JikanEndpoint('GET', '/anime', 'search')
+ANIME_DETAILS = JikanEndpoint('GET', '/anime/{anime_id}/full', 'anime')
+SEASON_ANIME = JikanEndpoint('GET', '/seasons/{year}/{season}', 'seasons')
+
+# Requests that change state upstream (COMMAND) must never be cached; only
+# idempotent lookups (INFORMATIONAL) are
+COMMAND_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+COMMAND_PATH_RE = re.compile(r"/(add|remove|update|delete|submit)(/|$)")
+
+def request_type(endpoint):
+    """Classify a Jikan endpoint as 'INFORMATIONAL' or 'COMMAND'"""
+    if endpoint.method.upper() in COMMAND_METHODS or COMMAND_PATH_RE.search(endpoint.path):
+        return 'COMMAND'
+    return 'INFORMATIONAL'
+
+def cacheable_informational(endpoint, show_spinner=True):
+    """Cache a fetcher of endpoint with its category's TTL, unless it is a COMMAND.
+
+    Pass show_spinner=False for fetchers called from worker threads: they
+    have no script context, so st.cache_data's miss spinner cannot render.
+    """
+    def decorator(func):
+        if request_type(endpoint) == 'COMMAND':
+            return func
+        return st.cache_data(ttl=CACHE_TTL[endpoint.category], show_spinner=show_spinner)(func)
+    
+    return decorator
 
 # API Functions (using Jikan API - unofficial MyAnimeList API)
-@st.cache_data(ttl=3600)
-def fetch_top_anime(page=1, limit=20):
-    """Fetch top anime from Jikan API"""
+def _jikan_get(endpoint, params=(), **path_args):
+    """Request a Jikan endpoint and return its annotated payload.
+
+    path_args fill the endpoint's path template. params is a tuple of
+    (key, value) pairs so callers' cache keys stay hashable. Failures
+    raise rather than return None: st.cache_data does not cache
+    exceptions, so a timeout or 429 is retried on the next call.
+    """
+    url = f"{JIKAN_BASE_URL}{endpoint.path.format(**path_args)}"
+    response = SESSION.request(endpoint.method, url, params=dict(params), timeout=10)
+    response.raise_for_status()
+    return annotate_anime(decode_json(response))
+
+def fetch_or_report(fetcher, error_message, *args):
+    """Call a cached fetcher, showing a failure with st.error and returning None"""
     try:
-        url = f"https://api.jikan.moe/v4/top/anime?page={page}&limit={limit}"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return fetcher(*args)
     except Exception as e:
-        st.error(f"Error fetching anime data: {e}")
+        st.error(f"{error_message}: {e}")
         return None
 
-@st.cache_data(ttl=3600)
+@cacheable_informational(TOP_ANIME, show_spinner=False)
+def _fetch_top_anime(page, limit):
+    """Fetch a page of top anime (raises on failure)"""
+    return _jikan_get(TOP_ANIME, (("limit", limit), ("page", page)))
+
+def fetch_top_anime(page=1, limit=20):
+    """Fetch top anime from Jikan API"""
+    # The cached fetcher has no spinner of its own (the prefetch thread calls it too)
+    with st.spinner("Loading top anime..."):
+        return fetch_or_report(_fetch_top_anime, "Error fetching anime data", page, limit)
+
+def normalize_query(query):
+    """Fold case and whitespace so equivalent searches share one cache entry"""
+    return " ".join(query.split()).lower()
+
 def search_anime(query):
     """Search for anime by name"""
-    try:
-        url = f"https://api.jikan.moe/v4/anime?q={query}&limit=20"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        st.error(f"Error searching anime: {e}")
-        return None
+    return fetch_or_report(_search_anime, "Error searching anime", normalize_query(query))
+
+@cacheable_informational(SEARCH_ANIME)
+def _search_anime(query):
+    """Search Jikan for an already-normalized query (raises on failure)"""
+    return _jikan_get(SEARCH_ANIME, (("limit", 20), ("q", query)))
+
+@cacheable_informational(ANIME_DETAILS, show_spinner=False)
+def _fetch_details_raw(anime_id):
+    """Fetch anime details without any Streamlit calls so it can run in worker threads (raises on failure)"""
+    return _jikan_get(ANIME_DETAILS, anime_id=anime_id)
 
-@st.cache_data(ttl=3600)
-def fetch_anime_details(anime_id):
-    """Fetch detailed information about a specific anime"""
+def _try_fetch_details(anime_id):
+    """Fetch anime details, returning None on failure"""
     try:
-        url = f"https://api.jikan.moe/v4/anime/{anime_id}/full"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        st.error(f"Error fetching anime details: {e}")
+        return _fetch_details_raw(anime_id)
+    except Exception:
         return None
 
-@st.cache_data(ttl=3600)
+def fetch_anime_bulk(anime_ids):
+    """Fetch details for several anime ids, mapping each id to its payload or None.
+
+    Jikan has no multi-id lookup, so the ids are fetched in parallel
+    (ThrottledAdapter keeps the burst within Jikan's rate limit). The
+    batch itself is not cached: each id goes through the per-id cache in
+    _fetch_details_raw, so one failed id is retried on the next render
+    instead of being pinned in a cached batch.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS) as executor:
+        return dict(zip(anime_ids, executor.map(_try_fetch_details, anime_ids)))
+
+@cacheable_informational(SEASON_ANIME)
+def _fetch_seasonal_anime(year, season):
+    """Fetch one season's anime (raises on failure)"""
+    return _jikan_get(SEASON_ANIME, year=year, season=season)
+
 def fetch_seasonal_anime(year, season):
     """Fetch seasonal anime"""
-    try:
-        url = f"https://api.jikan.moe/v4/seasons/{year}/{season}"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        st.error(f"Error fetching seasonal anime: {e}")
-        return None
+    return fetch_or_report(_fetch_seasonal_anime, "Error fetching seasonal anime", year, season)
+
+@st.cache_resource
+def _prefetch_state():
+    """In-flight prefetch keys, when each key was last warmed, and their lock; shared across reruns"""
+    return set(), {}, threading.Lock()
+
+def prefetch_top_anime(page, limit):
+    """Warm the top anime cache for a page in a background thread.
+
+    Pages warmed within the cache TTL are skipped. Failures are dropped:
+    _fetch_top_anime raises instead of caching them, and the worker never
+    calls st.error (it has no script context to render into).
+    """
+    in_flight, warmed_at, lock = _prefetch_state()
+    key = (page, limit)
+    with lock:
+        if key in in_flight or time.monotonic() - warmed_at.get(key, float('-inf')) < CACHE_TTL['top']:
+            return
+        in_flight.add(key)
+    
+    def worker():
+        try:
+            _fetch_top_anime(page, limit)
+            with lock:
+                warmed_at[key] = time.monotonic()
+        except Exception:
+            pass
+        finally:
+            with lock:
+                in_flight.discard(key)
+    
+    threading.Thread(target=worker, daemon=True).start()
+
+def change_top_page(step):
+    """Move the Top Rated page (runs as a button callback, before the rerun renders)"""
+    st.session_state.page_num = min(100, max(1, st.session_state.page_num + step))
+
+def filter_sort_anime(animes, min_score=0.0, min_year=0):
+    """Keep anime at or above the score/year thresholds, highest score first"""
+    kept = [
+        anime for anime in animes
+        if (anime.get('score') or 0) >= min_score and (anime.get('year') or 0) >= min_year
+    ]
+    return sorted(kept, key=lambda anime: anime.get('score') or 0, reverse=True)
 
 def display_anime_card(anime):
     """Display an anime card with information"""
@@ -111,9 +443,18 @@ def display_anime_card(anime):
         col1, col2 = st.columns([1, 3])
         
         with col1:
-            # Display anime image
-            if anime.get('images', {}).get('jpg', {}).get('large_image_url'):
-                st.image(anime['images']['jpg']['large_image_url'], use_container_width=True)
+            # Display anime image (lazy-loaded by the browser straight from the CDN)
+            if anime['_image_url']:
+                st.markdown(
+                    f'<img src="{anime["_image_url"]}" loading="lazy" width="100%"/>',
+                    unsafe_allow_html=True
+                )
+            if anime['_image_url_large']:
+                with st.expander("🖼️ Show full image"):
+                    st.markdown(
+                        f'<img src="{anime["_image_url_large"]}" loading="lazy" width="100%"/>',
+                        unsafe_allow_html=True
+                    )
         
         with col2:
             # Title
@@ -144,10 +485,9 @@ def display_anime_card(anime):
                 st.metric("📊 Status", status)
             
             # Genres
-            if anime.get('genres'):
+            if anime['_genre_text']:
                 st.markdown("**Genres:**")
-                genre_text = " • ".join([g['name'] for g in anime['genres'][:5]])
-                st.markdown(f"🏷️ {genre_text}")
+                st.markdown(f"🏷️ {anime['_genre_text']}")
             
             # Synopsis
             if anime.get('synopsis'):
@@ -161,7 +501,7 @@ def display_anime_card(anime):
                 anime_id = anime.get('mal_id')
                 if st.button(f"❤️ Add to Favorites", key=f"fav_{anime_id}"):
                     if anime_id not in st.session_state.favorites:
-                        st.session_state.favorites.append(anime_id)
+                        update_favorites(lambda favorites: favorites.setdefault(anime_id, None))
                         st.success(f"Added {title} to favorites!")
                     else:
                         st.info("Already in favorites!")
@@ -171,43 +511,54 @@ def display_anime_card(anime):
                     st.link_button("🔗 View on MyAnimeList", anime['url'])
             
             with btn_col3:
-                if anime.get('trailer', {}).get('url'):
-                    st.link_button("🎬 Watch Trailer", anime['trailer']['url'])
+                if anime['_trailer_url']:
+                    st.link_button("🎬 Watch Trailer", anime['_trailer_url'])
         
         st.divider()
 
-# Sidebar
-with st.sidebar:
-    st.title("🎌 Anime Hub")
-    st.markdown("---")
+def display_anime_table(animes):
+    """Display a list of anime as a single table instead of one card per anime"""
+    import pandas as pd  # imported lazily: only this view needs it
     
-    # Navigation
-    page = st.radio(
-        "Navigation",
-        ["🏠 Home", "🔍 Search", "📅 Seasonal", "⭐ Top Rated", "❤️ Favorites"],
-        label_visibility="collapsed"
+    rows = [
+        {
+            'Image': anime['_image_url'],
+            'Title': anime.get('title', 'Unknown Title'),
+            'Score': anime.get('score'),
+            'Episodes': anime.get('episodes'),
+            'Year': anime.get('year'),
+            'URL': anime.get('url'),
+        }
+        for anime in animes
+    ]
+    st.dataframe(
+        pd.DataFrame(rows),
+        column_config={
+            'Image': st.column_config.ImageColumn("Cover"),
+            'URL': st.column_config.LinkColumn("MyAnimeList", display_text="Open"),
+        },
+        hide_index=True,
+        width="stretch"
     )
-    
-    st.markdown("---")
-    
-    # Filters (for applicable pages)
-    if page in ["⭐ Top Rated", "📅 Seasonal"]:
-        st.subheader("Filters")
-        
-        if page == "📅 Seasonal":
-            current_year = datetime.now().year
-            year = st.selectbox("Year", range(current_year, 1989, -1), index=0)
-            season = st.selectbox("Season", ["winter", "spring", "summer", "fall"])
-    
-    st.markdown("---")
-    st.markdown("### About")
-    st.info("Discover and explore anime from MyAnimeList database. Data provided by Jikan API.")
 
-# Main content area
-st.title("🎌 Anime Hub - Your Anime Discovery Platform")
+# Pages: the radio stores an IntEnum and dispatches through RENDERERS
+class Page(IntEnum):
+    HOME = 0
+    SEARCH = 1
+    SEASONAL = 2
+    TOP = 3
+    FAVS = 4
+
+PAGE_LABELS = {
+    Page.HOME: "🏠 Home",
+    Page.SEARCH: "🔍 Search",
+    Page.SEASONAL: "📅 Seasonal",
+    Page.TOP: "⭐ Top Rated",
+    Page.FAVS: "❤️ Favorites",
+}
 
-# Home Page
-if page == "🏠 Home":
+def render_home():
+    """Render the Home page"""
     st.header("🔥 Trending Anime")
     st.markdown("Explore the most popular anime titles right now!")
     
@@ -219,12 +570,16 @@ if page == "🏠 Home":
     else:
         st.warning("Unable to load anime data. Please try again later.")
 
-# Search Page
-elif page == "🔍 Search":
+def render_search():
+    """Render the Search page"""
     st.header("🔍 Search Anime")
     
-    search_query = st.text_input("Enter anime name:", placeholder="e.g., Naruto, One Piece, Death Note...")
+    # A form only sends the query on submit, not on every edit of the text box
+    with st.form("search_form"):
+        search_query = st.text_input("Enter anime name:", placeholder="e.g., Naruto, One Piece, Death Note...")
+        st.form_submit_button("🔍 Search")
     
+    search_query = search_query.strip()
     if search_query:
         with st.spinner("Searching..."):
             data = search_anime(search_query)
@@ -239,8 +594,11 @@ elif page == "🔍 Search":
     else:
         st.info("👆 Enter an anime name to start searching!")
 
-# Seasonal Page
-elif page == "📅 Seasonal":
+def render_seasonal():
+    """Render the Seasonal page"""
+    year = st.session_state.season_year
+    season = st.session_state.season_name
+    
     st.header(f"📅 Seasonal Anime - {season.capitalize()} {year}")
     
     data = fetch_seasonal_anime(year, season)
@@ -253,67 +611,131 @@ elif page == "📅 Seasonal":
     else:
         st.warning("Unable to load seasonal anime data.")
 
-# Top Rated Page
-elif page == "⭐ Top Rated":
+def render_top_rated():
+    """Render the Top Rated page"""
     st.header("⭐ Top Rated Anime of All Time")
     
     # Pagination
-    page_num = st.number_input("Page", min_value=1, max_value=100, value=1, step=1)
+    page_num = st.session_state.setdefault('page_num', 1)
     
     data = fetch_top_anime(page=page_num, limit=25)
     
     if data and data.get('data'):
         st.success(f"Showing top anime - Page {page_num}")
         
-        for anime in data['data']:
-            display_anime_card(anime)
+        animes = data['data']
+        display_anime_table(animes)
         
-        # Pagination controls
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col1:
-            if page_num > 1:
-                if st.button("⬅️ Previous Page"):
-                    st.rerun()
-        with col3:
-            if st.button("Next Page ➡️"):
-                st.rerun()
+        # Full card only for the anime the user picks
+        selected = st.selectbox(
+            "Show details for",
+            range(len(animes)),
+            format_func=lambda i: animes[i].get('title', 'Unknown Title')
+        )
+        display_anime_card(animes[selected])
+        
+        # Warm the next page while the user reads this one
+        if page_num < 100:
+            prefetch_top_anime(page_num + 1, 25)
     else:
         st.warning("Unable to load top anime data.")
+    
+    # Pagination controls (shown even when a page fails, so the user can move off it)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if page_num > 1:
+            st.button("⬅️ Previous Page", on_click=change_top_page, args=(-1,))
+    with col2:
+        st.markdown(f"<p style='text-align: center;'>Page {page_num}</p>", unsafe_allow_html=True)
+    with col3:
+        if page_num < 100:
+            st.button("Next Page ➡️", on_click=change_top_page, args=(1,))
 
-# Favorites Page
-elif page == "❤️ Favorites":
+def render_favorites():
+    """Render the Favorites page"""
     st.header("❤️ Your Favorite Anime")
     
     if st.session_state.favorites:
         st.success(f"You have {len(st.session_state.favorites)} favorites")
         
         if st.button("🗑️ Clear All Favorites"):
-            st.session_state.favorites = []
+            update_favorites(dict.clear)
             st.rerun()
         
-        for anime_id in st.session_state.favorites:
-            with st.spinner(f"Loading anime {anime_id}..."):
-                details = fetch_anime_details(anime_id)
+        favorite_ids = list(st.session_state.favorites)
+        with st.spinner(f"Loading {len(favorite_ids)} favorites..."):
+            results = fetch_anime_bulk(favorite_ids)
+        
+        favorite_animes = []
+        for anime_id in favorite_ids:
+            details = results.get(anime_id)
+            if details is None:
+                st.error(f"Error fetching anime details for {anime_id}")
+            elif details.get('data'):
+                favorite_animes.append(details['data'])
+        
+        # Sort / filter controls
+        filter_col1, filter_col2 = st.columns(2)
+        with filter_col1:
+            min_score = st.slider("Minimum score", 0.0, 10.0, 0.0, 0.5)
+        with filter_col2:
+            min_year = st.number_input("Released in or after", min_value=0, max_value=2100, value=0, step=1)
+        
+        for anime in filter_sort_anime(favorite_animes, min_score, min_year):
+            anime_id = anime.get('mal_id')
+            display_anime_card(anime)
             
-            if details and details.get('data'):
-                anime = details['data']
-                display_anime_card(anime)
-                
-                if st.button(f"Remove from Favorites", key=f"remove_{anime_id}"):
-                    st.session_state.favorites.remove(anime_id)
-                    st.rerun()
+            if st.button(f"Remove from Favorites", key=f"remove_{anime_id}"):
+                update_favorites(lambda favorites: favorites.pop(anime_id, None))
+                st.rerun()
     else:
         st.info("You haven't added any favorites yet! Browse anime and click '❤️ Add to Favorites' to save them here.")
         
         if st.button("🏠 Go to Home"):
             st.rerun()
 
+RENDERERS = {
+    Page.HOME: render_home,
+    Page.SEARCH: render_search,
+    Page.SEASONAL: render_seasonal,
+    Page.TOP: render_top_rated,
+    Page.FAVS: render_favorites,
+}
+
+# Sidebar
+with st.sidebar:
+    st.title("🎌 Anime Hub")
+    st.markdown("---")
+    
+    # Navigation
+    page = st.radio(
+        "Navigation",
+        list(Page),
+        format_func=PAGE_LABELS.get,
+        label_visibility="collapsed"
+    )
+    
+    st.markdown("---")
+    
+    # Filters (for applicable pages)
+    if page in (Page.TOP, Page.SEASONAL):
+        st.subheader("Filters")
+        
+        if page == Page.SEASONAL:
+            current_year = time.gmtime().tm_year
+            st.selectbox("Year", range(current_year, 1989, -1), index=0, key="season_year")
+            st.selectbox("Season", ["winter", "spring", "summer", "fall"], key="season_name")
+    
+    st.markdown("---")
+    st.markdown("### About")
+    st.info("Discover and explore anime from MyAnimeList database. Data provided by Jikan API.")
+
+# Main content area
+st.title("🎌 Anime Hub - Your Anime Discovery Platform")
+
+RENDERERS[page]()
+
 # Footer
 st.markdown("---")
-st.markdown("""
-    <div style='text-align: center; color: #666;'>
-        <p>Powered by <a href='https://jikan.moe/' target='_blank'>Jikan API</a> (Unofficial MyAnimeList API)</p>
-        <p>Made with ❤️ using Streamlit</p>
-    </div>
-""", unsafe_allow_html=True)
+st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 